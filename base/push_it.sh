@@ -1,6 +1,7 @@
 #!/usr/bin/env bash
 set -euo pipefail
 # Usage: push_it.sh <PROJECT_DIR> <VERSION> <REPO_URL> <BRANCH> [COMMIT_MSG] [WHATS_NEW]
+# Env:   PUSHER_TRANSFER_PROFILE=auto|lan|balanced|slow|default (default: auto)
 
 PROJECT_DIR="${1:-}"
 VERSION="${2:-v1.0}"
@@ -13,6 +14,13 @@ die(){ echo "❌ $*" >&2; exit 1; }
 ok(){ echo "✅ $*"; }
 note(){ echo "ℹ️  $*"; }
 
+SCRIPT_PATH="${BASH_SOURCE[0]//\\//}"  # the GUI passes C:\...\base\push_it.sh on Windows
+SCRIPT_DIR="."
+[[ "$SCRIPT_PATH" == */* ]] && SCRIPT_DIR="${SCRIPT_PATH%/*}"
+SCRIPT_DIR="$(cd "$SCRIPT_DIR" && pwd)"
+# shellcheck source=transfer_profile.sh
+source "$SCRIPT_DIR/transfer_profile.sh"
+
 [[ -n "$PROJECT_DIR" ]] || die "Missing project folder"
 [[ -n "$REPO_URL"    ]] || die "Missing repo URL (e.g. https://github.com/user/repo.git)"
 [[ -n "$BRANCH"      ]] || die "Missing branch"
@@ -91,12 +99,34 @@ else
   ok "Added origin → $REPO_URL"
 fi
 
+# ---- Transfer profile ----
+# git's own write rate on earlier pushes to this remote (the wire speed), the
+# share of each push spent on the wire and the local core count decide
+# compression, delta search and HTTP buffering. Heavy compression is only
+# bought when the link, not the CPU, is the bottleneck (see transfer_profile.sh).
+TRANSFER_LOG="$(git rev-parse --git-dir)/pusher-transfer.log"
+REMOTE_KEY="$(printf '%s' "$REPO_URL" | sed -E 's#//[^/@]+@#//#')"  # drop credentials
+CORES="$(cpu_count)"
+read -r LINK_BPS LINK_PCT < <(link_history "$TRANSFER_LOG" "$REMOTE_KEY")
+
+PROFILE="${PUSHER_TRANSFER_PROFILE:-auto}"
+[[ "$PROFILE" == "auto" ]] && PROFILE="$(pick_profile "$LINK_BPS" "$LINK_PCT" "$CORES")"
+profile_args "$PROFILE" "$CORES" \
+  || die "Unknown PUSHER_TRANSFER_PROFILE: $PROFILE (use auto, lan, balanced, slow or default)"
+tgit(){ git ${TRANSFER_ARGS[@]+"${TRANSFER_ARGS[@]}"} "$@"; }
+
+if (( LINK_BPS > 0 )); then
+  note "Transfer profile: $PROFILE ($CORES cores, link ~$(human_bytes "$LINK_BPS")/s, ${LINK_PCT}% of push time on the wire)"
+else
+  note "Transfer profile: $PROFILE ($CORES cores, no throughput history yet)"
+fi
+
 # ---- Sync with Remote ----
-if git ls-remote --heads origin "$BRANCH" | grep -q .; then
+if tgit ls-remote --heads origin "$BRANCH" | grep -q .; then
   note "Syncing with origin/$BRANCH"
   
   # Fetch latest changes
-  git fetch origin "$BRANCH"
+  tgit fetch origin "$BRANCH"
   
   # Check if branches have diverged
   LOCAL=$(git rev-parse HEAD 2>/dev/null || echo "")
@@ -140,18 +170,50 @@ git add -A
 git commit --allow-empty -m "$COMMIT_MSG" || true
 ok "Commit recorded: $COMMIT_MSG"
 
-git push -u origin "$BRANCH"
+PUSH_LOG="$(mktemp)"
+push_start="$(now_ms)"
+# C locale keeps the "Writing objects" progress line parseable; stamp_progress
+# shows the progress as usual and notes when writing starts.
+if ! { LC_ALL=C LANGUAGE=C tgit push --progress -u origin "$BRANCH" 2>&1 1>&3 | stamp_progress "$PUSH_LOG"; } 3>&1; then
+  rm -f "$PUSH_LOG"
+  die "git push failed"
+fi
+push_end="$(now_ms)"
+read -r PUSH_BYTES WRITE_START < <(parse_push_progress "$PUSH_LOG")
+rm -f "$PUSH_LOG"
 ok "Pushed branch '$BRANCH'"
 
+# ---- Record transfer ----
+# The wire clock runs until git push exits, so it covers data that
+# git-remote-http buffered in http.postBuffer and sent after "Writing objects".
+push_ms=$(( push_end - push_start ))
+(( push_ms > 0 )) || push_ms=1
+wire_ms=0
+(( WRITE_START > 0 )) && wire_ms=$(( push_end - WRITE_START ))
+(( wire_ms <= push_ms )) || wire_ms=$push_ms
+PUSH_BPS=0
+(( wire_ms > 0 )) && PUSH_BPS=$(( PUSH_BYTES * 1000 / wire_ms ))
+printf '%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\n' \
+  "$(date '+%Y-%m-%dT%H:%M:%S')" "$REMOTE_KEY" "$PROFILE" "$CORES" \
+  "$PUSH_BYTES" "$push_ms" "$PUSH_BPS" "$wire_ms" "$LINK_BPS" >> "$TRANSFER_LOG"
+secs(){ echo "$(( $1 / 1000 )).$(( $1 % 1000 / 100 ))s"; }
+if (( PUSH_BYTES >= MIN_SAMPLE_BYTES )); then
+  effect=""
+  (( LINK_BPS > 0 )) && effect=", $(( PUSH_BPS * 100 / LINK_BPS ))% of previous median"
+  note "Transfer: $(human_bytes "$PUSH_BYTES") in $(secs "$push_ms") ($(secs "$wire_ms") on the wire at $(human_bytes "$PUSH_BPS")/s$effect, $(secs $(( push_ms - wire_ms ))) packing/handshake) [$PROFILE]"
+else
+  note "Transfer: $(human_bytes "$PUSH_BYTES") in $(secs "$push_ms") [$PROFILE] (too small to sample the link)"
+fi
+
 # ---- Tag ----
-if git ls-remote --tags origin "refs/tags/$VERSION" | grep -q .; then
+if tgit ls-remote --tags origin "refs/tags/$VERSION" | grep -q .; then
   note "Tag '$VERSION' exists on remote; skipping."
 else
   if ! git show-ref --quiet --tags "refs/tags/$VERSION" ; then
     git tag -a "$VERSION" -m "Release $VERSION"
     ok "Created tag '$VERSION'"
   fi
-  git push origin "$VERSION"
+  tgit push origin "$VERSION"
   ok "Pushed tag '$VERSION'"
 fi
 
@@ -0,0 +1,128 @@
+#!/usr/bin/env bash
+# Transfer profile helpers, sourced by push_it.sh.
+#
+# pusher-transfer.log (one tab-separated row per push):
+#   date  remote  profile  cores  bytes  wall_ms  link_bps  link_ms  prior_link_bps
+# link_ms runs from the first "Writing objects" progress line until git push
+# exits, and link_bps = bytes / link_ms. Everything before that (handshake,
+# counting, compressing) is local packing time. Git's own "| X MiB/s" figure is
+# not used: it is the rate pack-objects fills a pipe or git-remote-http's
+# http.postBuffer, not the link speed, so it would change with the profile.
+
+MIN_SAMPLE_BYTES=262144     # smaller pushes measure latency, not bandwidth
+LAN_BPS=10485760            # >= 10 MiB/s: the link is never the bottleneck
+SLOW_BPS=1048576            # <  1 MiB/s: heavy compression can pay off
+LINK_BOUND_PCT=50           # ...but only when the wire takes at least half the push
+
+cpu_count(){
+  local n="${NUMBER_OF_PROCESSORS:-}"
+  [[ -n "$n" ]] || n="$(nproc 2>/dev/null || getconf _NPROCESSORS_ONLN 2>/dev/null || echo 1)"
+  [[ "$n" =~ ^[0-9]+$ && "$n" -gt 0 ]] || n=1
+  echo "$n"
+}
+
+now_ms(){
+  if [[ -n "${EPOCHREALTIME:-}" ]]; then   # bash 5: no date process
+    local t="${EPOCHREALTIME/[.,]/}"
+    echo $(( t / 1000 ))
+    return
+  fi
+  local t
+  t="$(date +%s%N 2>/dev/null || true)"
+  if [[ "$t" =~ ^[0-9]+$ ]]; then
+    echo $(( t / 1000000 ))
+  else
+    echo $(( $(date +%s) * 1000 ))
+  fi
+}
+
+human_bytes(){
+  awk -v b="${1:-0}" 'BEGIN{
+    split("B KiB MiB GiB", u, " "); i=1
+    while (b >= 1024 && i < 4) { b /= 1024; i++ }
+    printf (i == 1 ? "%d %s" : "%.1f %s"), b, u[i]
+  }'
+}
+
+# stamp_progress <log file>: copy git push's stderr (stdin) to stderr and to the
+# log, then append "write_start_ms <ms>" for the first "Writing objects" update
+# (0 if nothing was written).
+stamp_progress(){
+  local chunk started=0 more=1
+  : > "$1"
+  while (( more )); do
+    IFS= read -r -d $'\r' chunk || more=0
+    (( more )) && chunk+=$'\r'
+    [[ -n "$chunk" ]] || continue
+    printf '%s' "$chunk" >&2
+    printf '%s' "$chunk" >> "$1"
+    if (( started == 0 )) && [[ "$chunk" == *"Writing objects"* ]]; then
+      started="$(now_ms)"
+    fi
+  done
+  printf '\nwrite_start_ms %s\n' "$started" >> "$1"
+}
+
+# parse_push_progress <log file> -> "<bytes> <write_start_ms>" from the last
+# "Writing objects: 100% (n/n), 1.20 MiB | ..., done." line and stamp_progress.
+# Needs git to run with LC_ALL=C; localized progress parses to 0 bytes.
+parse_push_progress(){
+  tr '\r' '\n' < "$1" | awk '
+    /^(remote: )?Writing objects/ { line = $0 }
+    $1 == "write_start_ms" { started = $2 }
+    END {
+      bytes = 0
+      n = split(line, f, /[ ,|]+/)
+      for (i = 2; i <= n && !bytes; i++) {
+        m = (f[i] == "bytes") ? 1 : (f[i] == "KiB") ? 1024 : (f[i] == "MiB") ? 1048576 : (f[i] == "GiB") ? 1073741824 : 0
+        if (m) bytes = f[i-1] * m
+      }
+      printf "%.0f %.0f\n", bytes, started
+    }'
+}
+
+# link_history <log> <remote> -> "<link_bps> <link_pct>": medians over the last
+# five samples big enough to measure, or "0 0" with no history.
+link_history(){
+  [[ -f "$1" ]] || { echo "0 0"; return; }
+  awk -F'\t' -v r="$2" -v min="$MIN_SAMPLE_BYTES" '
+    function median(a, k,   i, j, x, v) {
+      for (i = 0; i < k; i++) v[i] = a[i]
+      for (i = 1; i < k; i++) { x = v[i]; for (j = i - 1; j >= 0 && v[j] > x; j--) v[j+1] = v[j]; v[j+1] = x }
+      return k % 2 ? v[int(k/2)] : (v[k/2-1] + v[k/2]) / 2
+    }
+    BEGIN { n = 0 }
+    NF >= 9 && $2 == r && $5 >= min && $6 > 0 && $7 > 0 { bps[n] = $7; pct[n] = 100 * $8 / $6; n++ }
+    END {
+      if (!n) { print "0 0"; exit }
+      k = 0
+      for (i = (n > 5 ? n - 5 : 0); i < n; i++) { b[k] = bps[i]; p[k] = pct[i]; k++ }
+      printf "%.0f %.0f\n", median(b, k), median(p, k)
+    }' "$1"
+}
+
+# pick_profile <link_bps> <link_pct> <cores>
+pick_profile(){
+  local bps="$1" pct="$2" cores="$3"
+  if (( bps == 0 )); then
+    echo default
+  elif (( bps >= LAN_BPS )); then
+    echo lan
+  elif (( bps < SLOW_BPS && pct >= LINK_BOUND_PCT && cores >= 2 )); then
+    echo slow
+  else
+    echo balanced
+  fi
+}
+
+# profile_args <profile> <cores> -> sets TRANSFER_ARGS; "default" leaves git's
+# own settings untouched.
+profile_args(){
+  case "$1" in
+    lan)      TRANSFER_ARGS=(-c protocol.version=2 -c pack.compression=1 -c pack.window=10 -c http.postBuffer=67108864) ;;
+    balanced) TRANSFER_ARGS=(-c protocol.version=2 -c pack.compression=6 -c pack.window=10 -c http.postBuffer=16777216) ;;
+    slow)     TRANSFER_ARGS=(-c protocol.version=2 -c pack.compression=9 -c "pack.window=$(( $2 >= 4 ? 50 : 20 ))" -c http.postBuffer=1048576) ;;
+    default)  TRANSFER_ARGS=() ;;
+    *) return 1 ;;
+  esac
+}
@@ -69,6 +69,7 @@ if exist "%PROJ%dist\GitPusher.exe" (
   --noconsole --onefile ^
   --name GitPusher ^
   --add-data "base\push_it.sh;base" ^
+  --add-data "base\transfer_profile.sh;base" ^
   gui\main.py
 
 echo.
@@ -0,0 +1,338 @@
+"""Detect heavy generated directories and propose .gitignore rules before git add -A"""
+import os
+import shutil
+import subprocess
+from fnmatch import fnmatch
+
+# Same list push_it.sh writes when a project has no .gitignore
+DEFAULT_RULES = [
+    "build/", "dist/", "*.spec", "*.exe", "__pycache__/", "*.pyc", "*.log",
+    ".DS_Store", "Thumbs.db", "node_modules/",
+]
+BLOCK_HEADER = "# Added by Git Pusher (generated / heavy directories)"
+DECLINED_HEADER = "# Git Pusher: suggestions declined, kept in the push"
+DECLINED_PREFIX = "#keep "
+
+# Names that are generated output wherever they appear
+ALWAYS = {
+    "node_modules": "Node.js dependencies",
+    "__pycache__": "Python bytecode cache",
+    ".venv": "Python virtual environment",
+    ".pytest_cache": "pytest cache",
+    ".mypy_cache": "mypy cache",
+    ".ruff_cache": "ruff cache",
+    ".tox": "tox environments",
+    ".nox": "nox environments",
+    ".gradle": "Gradle cache",
+    ".next": "Next.js build output",
+    ".nuxt": "Nuxt build output",
+    ".parcel-cache": "Parcel cache",
+    ".turbo": "Turborepo cache",
+    ".ipynb_checkpoints": "Jupyter checkpoints",
+}
+
+# Ambiguous names, only ignored next to a marker file of that project type
+PROJECT_TYPES = {
+    "Python": ({"pyproject.toml", "setup.py", "setup.cfg", "requirements.txt", "Pipfile"},
+               {"build": "Python build output", "dist": "Python distributions"}),
+    "Node.js": ({"package.json"},
+                {"dist": "Node.js build output", "build": "Node.js build output",
+                 "coverage": "test coverage output", ".cache": "bundler cache"}),
+    "Rust": ({"Cargo.toml"}, {"target": "Cargo build output"}),
+    "Maven": ({"pom.xml"}, {"target": "Maven build output"}),
+    "Gradle": ({"build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts"},
+               {"build": "Gradle build output"}),
+    ".NET": ({".sln", ".csproj", ".fsproj", ".vbproj"},
+             {"bin": ".NET build output", "obj": ".NET intermediate output"}),
+}
+
+# Data-looking folders are only proposed once they are this heavy
+DATA_NAMES = {"data", "dataset", "datasets", "checkpoints", "models", "runs", "wandb", "outputs", "logs"}
+DATA_MIN_BYTES = 100 * 1024 * 1024
+DATA_MIN_FILES = 10000
+
+
+class Suggestion:
+    """One proposed ignore rule with what it would keep out of the commit"""
+
+    def __init__(self, pattern, reason):
+        self.pattern = pattern
+        self.reason = reason
+        self.bytes = 0
+        self.files = 0
+        self.tracked = 0  # files already in git; an ignore rule does not untrack them
+        self.paths = []
+
+    def __repr__(self):
+        return f"Suggestion({self.pattern!r}, {self.bytes} bytes, {self.files} files)"
+
+
+def human_size(num: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if num < 1024 or unit == "GiB":
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+
+
+def _parse_ignore(lines) -> list[str]:
+    return [l.strip("/") for l in (x.strip() for x in lines)
+            if l and not l.startswith(("#", "!")) and l.strip("/")]
+
+
+def _read_lines(path: str) -> list[str] | None:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            return fh.read().splitlines()
+    except OSError:
+        return None
+
+
+def read_ignore_patterns(project: str) -> list[str]:
+    """Top-level .gitignore patterns (or the defaults about to be written), without
+    comments, negations or slashes at the ends"""
+    lines = _read_lines(os.path.join(project, ".gitignore"))
+    return _parse_ignore(DEFAULT_RULES if lines is None else lines)
+
+
+def read_declined(project: str) -> set[str]:
+    """Patterns the user already chose to keep in the push"""
+    lines = _read_lines(os.path.join(project, ".gitignore")) or []
+    return {l[len(DECLINED_PREFIX):].strip() for l in lines if l.startswith(DECLINED_PREFIX)}
+
+
+def _is_ignored(rel: str, name: str, scoped: list[tuple[str, str]]) -> bool:
+    """Match against (base dir, pattern) pairs gathered from every .gitignore above rel"""
+    for base, pattern in scoped:
+        if base and not rel.startswith(base + "/"):
+            continue
+        sub = rel[len(base) + 1:] if base else rel
+        if fnmatch(name, pattern) or fnmatch(sub, pattern):
+            return True
+    return False
+
+
+def _listdir(path: str, cache: dict) -> list | None:
+    """Directory entries, reusing a listing taken earlier by _tree_size"""
+    if path in cache:
+        return cache.pop(path)
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return None
+
+
+def _tree_size(entries: list, cache: dict | None = None) -> tuple[int, int]:
+    """Total bytes and file count under an already-listed directory (symlinks not
+    followed); subdirectory listings are kept in cache when one is given"""
+    total = files = 0
+    stack = [entries]
+    while stack:
+        for entry in stack.pop():
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    children = _listdir(entry.path, {})
+                    if children is not None:
+                        if cache is not None:
+                            cache[entry.path] = children
+                        stack.append(children)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+                    files += 1
+            except OSError:
+                continue
+    return total, files
+
+
+def _classify(name: str, entry_names: set, parent_rules: dict) -> tuple[str, str] | None:
+    """(pattern kind, reason) if a directory should be ignored, else None"""
+    if name in ALWAYS:
+        return "name", ALWAYS[name]
+    if "pyvenv.cfg" in entry_names:
+        return "path", "Python virtual environment"
+    if "CACHEDIR.TAG" in entry_names:
+        return "path", "cache directory (CACHEDIR.TAG)"
+    if name in parent_rules:
+        return "path", parent_rules[name]
+    return None
+
+
+def _marker_rules(entry_names: set) -> dict:
+    """Ambiguous directory names that are generated for the project types found here"""
+    rules = {}
+    suffixes = {os.path.splitext(n)[1] for n in entry_names}
+    for markers, dirs in PROJECT_TYPES.values():
+        if entry_names & markers or suffixes & markers:
+            for name, reason in dirs.items():
+                rules.setdefault(name, reason)
+    return rules
+
+
+def scan_project(project: str, git: str | None = None) -> list[Suggestion]:
+    """Walk the project once and return ignore suggestions, heaviest first.
+
+    When the project is already a git repository, the sizes are recounted from
+    what `git add -A` would actually stage (see _refine_with_git).
+    """
+    declined = read_declined(project)
+    found = {}
+    cache = {}
+
+    def add(pattern, reason, path, size):
+        s = found.setdefault(pattern, Suggestion(pattern, reason))
+        s.bytes += size[0]
+        s.files += size[1]
+        s.paths.append(path)
+
+    root_entries = _listdir(project, cache)
+    if root_entries is None:
+        return []
+    stack = [("", root_entries, [("", p) for p in read_ignore_patterns(project)])]
+    while stack:
+        rel_dir, entries, scoped = stack.pop()
+        names = {e.name for e in entries}
+        rules = _marker_rules(names)
+        if rel_dir and ".gitignore" in names:
+            nested = _read_lines(os.path.join(project, rel_dir, ".gitignore")) or []
+            scoped = scoped + [(rel_dir, p) for p in _parse_ignore(nested)]
+
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False) or entry.name == ".git":
+                    continue
+            except OSError:
+                continue
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if _is_ignored(rel, entry.name, scoped):
+                continue
+            children = _listdir(entry.path, cache)
+            if children is None:
+                continue
+
+            hit = _classify(entry.name, {c.name for c in children}, rules)
+            if hit:
+                kind, reason = hit
+                pattern = f"{entry.name}/" if kind == "name" else f"/{rel}/"
+                if pattern not in declined:
+                    add(pattern, reason, rel, _tree_size(children))
+                    continue
+            elif entry.name.lower() in DATA_NAMES and f"/{rel}/" not in declined:
+                listings = {}
+                size = _tree_size(children, listings)
+                if size[0] >= DATA_MIN_BYTES or size[1] >= DATA_MIN_FILES:
+                    add(f"/{rel}/", "large data directory", rel, size)
+                    continue
+                cache.update(listings)  # walk on without listing these again
+            stack.append((rel, children, scoped))
+
+    suggestions = list(found.values())
+    if os.path.isdir(os.path.join(project, ".git")):
+        suggestions = _refine_with_git(project, suggestions, git or shutil.which("git"))
+    return sorted(suggestions, key=lambda s: (s.bytes, s.files), reverse=True)
+
+
+def _git_files(git: str, project: str, args: list[str], paths: list[str]) -> list[str]:
+    """Run `git ls-files -z <args> -- <paths>` in batches and return the file paths"""
+    files = []
+    for i in range(0, len(paths), 200):
+        result = subprocess.run(
+            [git, "-C", project, "--literal-pathspecs", "ls-files", "-z", *args, "--", *paths[i:i + 200]],
+            capture_output=True, timeout=120, check=True,
+        )
+        files += [f for f in result.stdout.decode("utf-8", "surrogateescape").split("\0") if f]
+    return files
+
+
+def _refine_with_git(project: str, suggestions: list[Suggestion], git: str | None) -> list[Suggestion]:
+    """Recount sizes from what `git add -A` would stage (untracked, non-ignored
+    files), so nested .gitignore files, .git/info/exclude and core.excludesFile are
+    honoured. Tracked files are counted separately: the rule still keeps new files
+    out, but the tracked ones stay tracked. Falls back to the walk's estimate
+    without git."""
+    if not git or not suggestions:
+        return suggestions
+    paths = [p for s in suggestions for p in s.paths]
+    try:
+        tracked = _git_files(git, project, [], paths)
+        stageable = _git_files(git, project, ["--others", "--exclude-standard"], paths)
+    except (OSError, subprocess.SubprocessError):
+        return suggestions
+
+    candidates = set(paths)
+
+    def owner(path):
+        parts = path.split("/")
+        for i in range(1, len(parts)):
+            prefix = "/".join(parts[:i])
+            if prefix in candidates:
+                return prefix
+        return None
+
+    tracked_count = {}
+    for f in tracked:
+        key = owner(f)
+        tracked_count[key] = tracked_count.get(key, 0) + 1
+    sizes = {}
+    for f in stageable:
+        key = owner(f)
+        try:
+            size = os.lstat(os.path.join(project, f)).st_size
+        except OSError:
+            continue
+        b, n = sizes.get(key, (0, 0))
+        sizes[key] = (b + size, n + 1)
+
+    refined = []
+    for s in suggestions:
+        s.bytes = sum(sizes.get(p, (0, 0))[0] for p in s.paths)
+        s.files = sum(sizes.get(p, (0, 0))[1] for p in s.paths)
+        s.tracked = sum(tracked_count.get(p, 0) for p in s.paths)
+        if not s.files:
+            continue
+        if s.reason == "large data directory" and s.bytes < DATA_MIN_BYTES and s.files < DATA_MIN_FILES:
+            continue
+        refined.append(s)
+    return refined
+
+
+def format_preview(suggestions: list[Suggestion], limit: int = 12) -> str:
+    """Human-readable summary for the confirmation dialog"""
+    lines = [
+        f"{s.pattern}  —  {human_size(s.bytes)}, {s.files:,} files ({s.reason})"
+        + (f"; {s.tracked:,} already tracked file(s) stay tracked" if s.tracked else "")
+        for s in suggestions[:limit]
+    ]
+    if len(suggestions) > limit:
+        lines.append(f"… and {len(suggestions) - limit} more")
+    total_bytes = sum(s.bytes for s in suggestions)
+    total_files = sum(s.files for s in suggestions)
+    lines.append("")
+    lines.append(f"Estimated savings: {human_size(total_bytes)} in {total_files:,} files")
+    return "\n".join(lines)
+
+
+def write_ignore_rules(project: str, suggestions: list[Suggestion]) -> str:
+    """Create or extend .gitignore with the suggested patterns; returns its path"""
+    path = os.path.join(project, ".gitignore")
+    _append_block(path, [BLOCK_HEADER] + [s.pattern for s in suggestions])
+    return path
+
+
+def _append_block(path: str, block: list[str]):
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            current = fh.read()
+        prefix = "" if not current or current.endswith("\n") else "\n"
+        with open(path, "a", encoding="utf-8", newline="\n") as fh:
+            fh.write(prefix + "\n" + "\n".join(block) + "\n")
+    else:
+        with open(path, "w", encoding="utf-8", newline="\n") as fh:
+            fh.write("\n".join(DEFAULT_RULES + [""] + block) + "\n")
+
+
+def remember_declined(project: str, suggestions: list[Suggestion]) -> str:
+    """Record declined patterns as comments in .gitignore so they are not offered again"""
+    path = os.path.join(project, ".gitignore")
+    block = [DECLINED_HEADER] + [DECLINED_PREFIX + s.pattern for s in suggestions]
+    _append_block(path, block)
+    return path
@@ -3,7 +3,9 @@ from tkinter import filedialog, messagebox
 import customtkinter as ctk
 import subprocess, os, sys, shlex, shutil
 import re
+import threading
 from urllib.parse import urlparse
+from ignore_scan import scan_project, format_preview, write_ignore_rules, remember_declined
 
 # ---------- paths & helpers ----------
 def resource_path(*parts):
@@ -24,6 +26,33 @@ def find_git_bash():
             return c
     return None
 
+def find_git(bash_exe):
+    """git.exe shipped next to Git Bash, else whatever git is on PATH"""
+    git_root = os.path.dirname(bash_exe)
+    for sub in ("", "bin", "cmd"):
+        c = os.path.join(git_root, sub, "git.exe")
+        if os.path.exists(c):
+            return c
+    return shutil.which("git")
+
+def run_in_background(func, args, on_done):
+    """Run func(*args) on a worker thread, then call on_done(value, error) on the Tk
+    thread. Polling uses root.after, so nothing runs once the window is closed."""
+    outcome = {}
+    def worker():
+        try:
+            outcome["value"] = func(*args)
+        except Exception as e:
+            outcome["error"] = e
+    t = threading.Thread(target=worker, daemon=True)
+    t.start()
+    def poll():
+        if t.is_alive():
+            root.after(100, poll)
+        else:
+            on_done(outcome.get("value"), outcome.get("error"))
+    root.after(100, poll)
+
 # ---------- Security validation functions ----------
 def validate_repo_url(url: str) -> tuple[bool, str]:
     """Validate repository URL format and safety"""
@@ -197,6 +226,9 @@ def set_project_folder(folder_path):
 
 def push_to_git(event=None):
     """Push to Git - main function called by button click"""
+    if push_btn.cget("state") == "disabled":
+        return  # a push (or its project scan) is already running
+    handed_off = False
     try:
         # Debug: Confirm function is being called
         set_status("Button clicked - starting push...", "info")
@@ -270,8 +302,47 @@ def push_to_git(event=None):
             set_status("push_it.sh not found.", "error")
             return
 
-        # Verify authentication before proceeding
+        # Keep heavy generated directories out of `git add -A`; the scan runs on a
+        # worker thread and finish_push takes over when it is done
         push_btn.configure(state="disabled")
+        set_status("Scanning project for heavy directories...", "info")
+        ctx = dict(project=project, version=version, repo=repo, branch=branch,
+                   commit=commit, whats_new=whats_new, bash_exe=bash_exe, sh_script=sh_script)
+        run_in_background(scan_project, (project, find_git(bash_exe)),
+                          lambda suggestions, error: finish_push(ctx, suggestions, error))
+        handed_off = True
+    except Exception as e:
+        show_push_error(e)
+    finally:
+        if not handed_off:
+            push_btn.configure(state="normal")
+
+def finish_push(ctx, suggestions, error):
+    """Second half of push_to_git: ignore preview, auth check and the push itself"""
+    project, version, repo = ctx["project"], ctx["version"], ctx["repo"]
+    branch, commit, whats_new = ctx["branch"], ctx["commit"], ctx["whats_new"]
+    bash_exe, sh_script = ctx["bash_exe"], ctx["sh_script"]
+    try:
+        if error:
+            raise error
+        if suggestions:
+            answer = messagebox.askyesnocancel(
+                "Ignore Heavy Directories?",
+                "These folders look generated and would be staged by this push:\n\n"
+                f"{format_preview(suggestions)}\n\n"
+                "Yes: add them to .gitignore\n"
+                "No: push everything anyway (won't ask again for these)\n"
+                "Cancel: stop")
+            if answer is None:
+                set_status("Push cancelled.", "warn")
+                return
+            if answer:
+                write_ignore_rules(project, suggestions)
+                set_status(f"Added {len(suggestions)} rule(s) to .gitignore", "ok")
+            else:
+                remember_declined(project, suggestions)
+
+        # Verify authentication before proceeding
         set_status("Verifying repository access...", "info")
         root.update_idletasks()
         
@@ -316,6 +387,15 @@ def push_to_git(event=None):
             msg = f"Commit:\n{human_commit}\n\nPushed to:\n{repo}\nBranch: {branch}\nTag: {version}"
             if whats_new:
                 msg += "\n\nWhat's new saved to WHATS_NEW.txt"
+            transfer_lines = [
+                line for line in (
+                    raw.replace("ℹ️", "", 1).strip()
+                    for raw in (result.stdout or "").splitlines()
+                )
+                if line.startswith(("Transfer:", "Transfer profile:"))
+            ]
+            if transfer_lines:
+                msg += "\n\n" + "\n".join(transfer_lines)
             messagebox.showinfo("Success", msg)
             set_status("Push completed successfully.", "ok")
         except subprocess.TimeoutExpired:
@@ -327,29 +407,32 @@ def push_to_git(event=None):
             error_msg = e.stderr if hasattr(e, 'stderr') and e.stderr else str(e)
             messagebox.showerror("Failed", f"Push failed.\n\n{error_msg}")
             set_status("Push failed. See error.", "error")
-    except NameError as e:
+    except Exception as e:
+        show_push_error(e)
+    finally:
+        push_btn.configure(state="normal")
+
+def show_push_error(e):
+    """Report an unexpected error from either half of the push"""
+    import traceback
+    if isinstance(e, NameError):
         # Handle case where variables might not be defined
         error_msg = f"Variable not found: {str(e)}\n\nThis might indicate a code order issue."
         messagebox.showerror("Configuration Error", error_msg)
         set_status(f"Error: Variable not found - {str(e)}", "error")
-        import traceback
         print(f"NameError traceback:\n{traceback.format_exc()}")
-    except AttributeError as e:
+    elif isinstance(e, AttributeError):
         # Handle case where UI elements might not be accessible
         error_msg = f"UI element not found: {str(e)}\n\nPlease check that all UI elements are properly initialized."
         messagebox.showerror("UI Error", error_msg)
         set_status(f"Error: UI element issue - {str(e)}", "error")
-        import traceback
         print(f"AttributeError traceback:\n{traceback.format_exc()}")
-    except Exception as e:
+    else:
         # Catch any other unexpected errors
         error_msg = f"Unexpected error occurred:\n\n{str(e)}\n\nType: {type(e).__name__}"
         messagebox.showerror("Unexpected Error", error_msg)
         set_status(f"Error: {str(e)}", "error")
-        import traceback
         print(f"Unexpected error traceback:\n{traceback.format_exc()}")
-    finally:
-        push_btn.configure(state="normal")
 
 # ---------- UI (ServiceToon-inspired design) ----------
 # Dark blue-green gradient with teal accents
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Checks for the heavy-directory detector behind the .gitignore preview.
+Run with: python -m pytest -q test_ignore_scan.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui"))
+
+import ignore_scan
+from ignore_scan import (scan_project, write_ignore_rules, remember_declined, format_preview,
+                         BLOCK_HEADER, DECLINED_HEADER)
+
+
+def make_file(root, rel, size=10):
+    path = os.path.join(root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fh:
+        fh.write(b"x" * size)
+
+
+def patterns(suggestions):
+    return {s.pattern for s in suggestions}
+
+
+def test_marker_gated_directories(tmp_path):
+    root = str(tmp_path)
+    make_file(root, "Cargo.toml")
+    make_file(root, "target/debug/app", 500)
+    make_file(root, "web/package.json")
+    make_file(root, "web/.next/cache/a.js", 200)
+    make_file(root, "docs/target/keep.md")       # no marker next to it
+    make_file(root, "env/pyvenv.cfg")
+    make_file(root, "env/lib/site.py", 300)
+
+    found = {s.pattern: s for s in scan_project(root)}
+    assert set(found) == {"/target/", ".next/", "/env/"}
+    assert (found["/target/"].bytes, found["/target/"].files) == (500, 1)
+    assert found["/env/"].files == 2
+
+
+def test_existing_rules_and_defaults_are_respected(tmp_path):
+    root = str(tmp_path)
+    make_file(root, "node_modules/pkg/index.js")    # covered by push_it.sh defaults
+    make_file(root, ".venv/pyvenv.cfg")
+    assert patterns(scan_project(root)) == {".venv/"}
+
+    with open(os.path.join(root, ".gitignore"), "w") as fh:
+        fh.write("/.venv/\n")
+    assert patterns(scan_project(root)) == {"node_modules/"}
+
+
+def test_small_data_folders_are_kept(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    make_file(root, "data/a.csv", 50)
+    make_file(root, "data/b.csv", 50)
+    assert scan_project(root) == []
+
+    monkeypatch.setattr("ignore_scan.DATA_MIN_FILES", 2)
+    assert patterns(scan_project(root)) == {"/data/"}
+
+
+def test_write_extends_or_creates_gitignore(tmp_path):
+    root = str(tmp_path)
+    make_file(root, ".tox/py/x")
+    suggestions = scan_project(root)
+    assert "Estimated savings: 10 B in 1 files" in format_preview(suggestions)
+
+    path = write_ignore_rules(root, suggestions)
+    text = Path(path).read_text()
+    assert text.startswith("build/\n") and text.endswith(f"{BLOCK_HEADER}\n.tox/\n")
+    assert scan_project(root) == []
+
+    with open(path, "w") as fh:
+        fh.write("*.log")
+    write_ignore_rules(root, suggestions)
+    assert Path(path).read_text() == f"*.log\n\n{BLOCK_HEADER}\n.tox/\n"
+
+
+def test_each_directory_is_listed_once(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    make_file(root, "src/pkg/mod.py")
+    make_file(root, "data/small/a.csv")        # sized, then walked from the cached listing
+    make_file(root, "node_modules/x/y/z.js")
+    listed = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        listed.append(os.path.normpath(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(ignore_scan.os, "scandir", counting_scandir)
+    with open(os.path.join(root, ".gitignore"), "w") as fh:
+        fh.write("")
+    assert patterns(scan_project(root)) == {"node_modules/"}
+    assert len(listed) == len(set(listed))
+
+
+def test_nested_gitignore_and_declined_patterns(tmp_path):
+    root = str(tmp_path)
+    make_file(root, "app/.gitignore")
+    Path(root, "app", ".gitignore").write_text("cache-dir/\n")
+    make_file(root, "app/cache-dir/CACHEDIR.TAG")
+    make_file(root, "app/.venv/pyvenv.cfg")
+    suggestions = scan_project(root)
+    assert patterns(suggestions) == {".venv/"}
+
+    remember_declined(root, suggestions)
+    assert DECLINED_HEADER in Path(root, ".gitignore").read_text()
+    assert scan_project(root) == []
+
+
+def test_git_repo_counts_only_what_add_would_stage(tmp_path):
+    if not ignore_scan.shutil.which("git"):
+        pytest.skip("git not installed")
+    root = str(tmp_path)
+    make_file(root, "Cargo.toml")
+    make_file(root, "target/release/app", 400)
+    make_file(root, "target/release/app.d", 100)
+    make_file(root, "web/package.json")
+    make_file(root, "web/coverage/index.html", 300)        # tracked: stays tracked, not counted
+    make_file(root, ".tox/py/x", 50)                   # excluded via .git/info/exclude
+    git = ["git", "-C", root, "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(git + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "web"], check=True)
+    subprocess.run(git + ["commit", "-qm", "web"], check=True)
+    Path(root, ".git", "info", "exclude").write_text("*.d\n.tox/\n")
+    make_file(root, "web/coverage/lcov.info", 200)         # untracked: the rule keeps it out
+
+    found = {s.pattern: s for s in scan_project(root)}
+    assert set(found) == {"/target/", "/web/coverage/"}
+    assert (found["/target/"].bytes, found["/target/"].files, found["/target/"].tracked) == (400, 1, 0)
+    assert (found["/web/coverage/"].bytes, found["/web/coverage/"].files, found["/web/coverage/"].tracked) == (200, 1, 1)
+    assert "1 already tracked file(s) stay tracked" in format_preview(list(found.values()))
+
+
+def test_committed_venv_marker_still_suggests_untracked_contents(tmp_path):
+    if not ignore_scan.shutil.which("git"):
+        pytest.skip("git not installed")
+    root = str(tmp_path)
+    make_file(root, ".venv/pyvenv.cfg")
+    make_file(root, ".venv/lib/site.py", 3000)
+    git = ["git", "-C", root, "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(git + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", ".venv/pyvenv.cfg"], check=True)
+    subprocess.run(git + ["commit", "-qm", "cfg"], check=True)
+
+    [venv] = scan_project(root)
+    assert (venv.pattern, venv.bytes, venv.files, venv.tracked) == (".venv/", 3000, 1, 1)
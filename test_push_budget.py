@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Round-trip and process-spawn budget check for push_it.sh and verify_git_auth.
+
+Serves a local bare repository through an ext:: transport that injects latency
+and a bandwidth cap, counts connections, ref advertisements and spawned
+processes per push scenario, and fails when a count exceeds push_budget.json.
+
+Usage:
+    python test_push_budget.py                    # check against the budget
+    python test_push_budget.py --latency-ms 150 --bandwidth-kbps 512
+    python test_push_budget.py --record           # rewrite the budget file
+"""
+
+import argparse
+import ast
+import json
+import os
+import queue
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PUSH_SCRIPT = os.path.join(HERE, "base", "push_it.sh")
+GUI_MAIN = os.path.join(HERE, "gui", "main.py")
+BUDGET_FILE = os.path.join(HERE, "push_budget.json")
+
+# External commands that push_it.sh may spawn; each gets a counting shim on PATH.
+# cygpath (Git Bash only) and nproc/getconf (skipped when NUMBER_OF_PROCESSORS is
+# set, as on Windows) depend on the host, so they are left out to keep
+# push_budget.json the same on Linux and Git Bash.
+COUNTED_TOOLS = [
+    "git", "awk", "sed", "tr", "grep", "date", "mktemp", "cat", "head", "tail",
+    "rm", "wc", "sort", "cut", "find", "du", "stat",
+]
+METRICS = ("connections", "ref_advertisements", "git_processes", "processes")
+
+
+# ---------- transport (runs as the ext:: helper) ----------
+def _pump(src_fd, dst_fd, latency, bandwidth, on_chunk=None):
+    """Copy src to dst, delaying each chunk by one-way latency and the bandwidth cap.
+    The queue holds one chunk, so the reader blocks until the previous chunk has
+    been delivered and the sender is throttled the way a real link would."""
+    pending = queue.Queue(maxsize=1)
+
+    def reader():
+        while True:
+            data = os.read(src_fd, 65536)
+            if on_chunk and data:
+                on_chunk(data)
+            pending.put((time.monotonic(), data))
+            if not data:
+                return
+
+    threading.Thread(target=reader, daemon=True).start()
+    free_at = 0.0
+    while True:
+        arrived, data = pending.get()
+        if not data:
+            return
+        deliver = max(arrived + latency, free_at)
+        if bandwidth:
+            deliver += len(data) / bandwidth
+        delay = deliver - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        free_at = deliver
+        os.write(dst_fd, data)
+
+
+def serve(service, repo):
+    """Proxy one git service connection to a local bare repository"""
+    latency = float(os.environ.get("PUSHER_TEST_LATENCY_MS", "0")) / 1000
+    bandwidth = int(os.environ.get("PUSHER_TEST_BANDWIDTH_KBPS", "0")) * 1024
+    events = os.environ["PUSHER_TEST_EVENTS"]
+
+    def record(event):
+        with open(events, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"event": event, "service": service}) + "\n")
+
+    record("connect")
+    server = subprocess.Popen(
+        [os.environ["PUSHER_TEST_REAL_GIT"], service.replace("git-", "", 1), repo],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+    )
+
+    # v0 advertises refs once per connection; v2 only on each ls-refs command
+    state = {"first": True, "v2": False, "tail": b""}
+
+    def from_server(data):
+        if state["first"]:
+            state["first"] = False
+            state["v2"] = data[4:13] == b"version 2"
+            if not state["v2"]:
+                record("ref_advertisement")
+
+    def from_client(data):
+        buf = state["tail"] + data
+        if state["v2"]:
+            for _ in range(buf.count(b"command=ls-refs")):
+                record("ref_advertisement")
+        state["tail"] = buf[-16:]
+
+    def upstream():
+        _pump(sys.stdin.fileno(), server.stdin.fileno(), latency, bandwidth, from_client)
+        server.stdin.close()
+
+    threading.Thread(target=upstream, daemon=True).start()
+    _pump(server.stdout.fileno(), sys.stdout.fileno(), latency, bandwidth, from_server)
+    return server.wait()
+
+
+# ---------- harness ----------
+def ext_url(repo):
+    """ext:: URL that routes git traffic for repo through this file's transport"""
+    parts = [sys.executable, os.path.abspath(__file__), "--serve", "%S", repo]
+    return "ext::" + " ".join(p.replace("%", "%%").replace(" ", "% ") if p != "%S" else p for p in parts)
+
+
+def make_shims(bin_dir, spawn_log):
+    """Put a counting wrapper for every available COUNTED_TOOLS entry in bin_dir"""
+    real = {}
+    for tool in COUNTED_TOOLS:
+        path = shutil.which(tool)
+        if not path:
+            continue
+        real[tool] = path
+        shim = os.path.join(bin_dir, tool)
+        with open(shim, "w", encoding="utf-8", newline="\n") as fh:
+            fh.write(f"#!/bin/sh\necho {tool} >> {shlex.quote(spawn_log)}\n"
+                     f"exec {shlex.quote(path)} \"$@\"\n")
+        os.chmod(shim, 0o755)
+    return real
+
+
+def load_verify_git_auth():
+    """Pull verify_git_auth out of gui/main.py without building the Tk window"""
+    with open(GUI_MAIN, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), GUI_MAIN)
+    node = next(n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name == "verify_git_auth")
+    namespace = {"subprocess": subprocess, "shlex": shlex}
+    exec(compile(ast.Module(body=[node], type_ignores=[]), GUI_MAIN, "exec"), namespace)
+    return namespace["verify_git_auth"]
+
+
+@contextmanager
+def patched_environ(env):
+    saved = os.environ.copy()
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def read_lines(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fh:
+        return [line.strip() for line in fh if line.strip()]
+
+
+@contextmanager
+def sandbox(latency_ms=25, bandwidth_kbps=0):
+    """Temp project, bare remote behind the ext:: transport and the env to drive them"""
+    work = tempfile.mkdtemp(prefix="pusher-budget-")
+    try:
+        bin_dir = os.path.join(work, "bin")
+        project = os.path.join(work, "project")
+        remote = os.path.join(work, "remote.git")
+        os.makedirs(bin_dir)
+        os.makedirs(project)
+        spawn_log = os.path.join(work, "spawns.log")
+        events_log = os.path.join(work, "events.log")
+        real = make_shims(bin_dir, spawn_log)
+        subprocess.run([real["git"], "init", "-q", "--bare", remote], check=True)
+
+        with open(os.path.join(project, "app.py"), "w", encoding="utf-8") as fh:
+            fh.write("print('hello')\n")
+
+        env = os.environ.copy()
+        env.update({
+            "PATH": bin_dir + os.pathsep + env.get("PATH", ""),
+            "HOME": work,
+            "GIT_CONFIG_NOSYSTEM": "1",
+            "GIT_CONFIG_COUNT": "2",
+            "GIT_CONFIG_KEY_0": "protocol.ext.allow",
+            "GIT_CONFIG_VALUE_0": "always",
+            "GIT_CONFIG_KEY_1": "init.defaultBranch",
+            "GIT_CONFIG_VALUE_1": "main",
+            "GIT_AUTHOR_NAME": "Git Pusher", "GIT_AUTHOR_EMAIL": "pusher@example.com",
+            "GIT_COMMITTER_NAME": "Git Pusher", "GIT_COMMITTER_EMAIL": "pusher@example.com",
+            "PUSHER_TEST_EVENTS": events_log,
+            "PUSHER_TEST_REAL_GIT": real["git"],
+            "PUSHER_TEST_LATENCY_MS": str(latency_ms),
+            "PUSHER_TEST_BANDWIDTH_KBPS": str(bandwidth_kbps),
+            "WHATS_NEW": "Budget check",
+        })
+        yield {
+            "env": env, "url": ext_url(remote), "project": project, "real": real,
+            "spawn_log": spawn_log, "events_log": events_log,
+        }
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def run_scenarios(latency_ms=25, bandwidth_kbps=0):
+    """Run every push scenario and return {scenario: {metric: count, "seconds": s}}"""
+    with sandbox(latency_ms, bandwidth_kbps) as box:
+        env, url, project = box["env"], box["url"], box["project"]
+        spawn_log, events_log = box["spawn_log"], box["events_log"]
+        verify_git_auth = load_verify_git_auth()
+
+        def auth_check():
+            with patched_environ(env):
+                ok, err = verify_git_auth(url, "bash")
+            if not ok:
+                raise RuntimeError(f"verify_git_auth failed: {err}")
+
+        def push(version, commit):
+            def run():
+                subprocess.run(["bash", PUSH_SCRIPT, project, version, url, "main", commit],
+                               env=env, check=True, capture_output=True, text=True)
+            return run
+
+        def edit_then(step):
+            def run():
+                with open(os.path.join(project, "app.py"), "a", encoding="utf-8") as fh:
+                    fh.write("print('again')\n")
+                step()
+            return run
+
+        scenarios = [
+            ("auth_check", auth_check),
+            ("first_push", push("v1.0", "First push")),
+            ("repeat_push", push("v1.1", "Nothing changed")),
+            ("update_push", edit_then(push("v1.2", "Small edit"))),
+        ]
+
+        results = {}
+        for name, step in scenarios:
+            for log in (spawn_log, events_log):
+                if os.path.exists(log):
+                    os.remove(log)
+            started = time.monotonic()
+            try:
+                step()
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"{name} failed:\n{e.stdout}\n{e.stderr}") from e
+            spawns = read_lines(spawn_log)
+            events = [json.loads(line)["event"] for line in read_lines(events_log)]
+            results[name] = {
+                "connections": events.count("connect"),
+                "ref_advertisements": events.count("ref_advertisement"),
+                "git_processes": spawns.count("git"),
+                "processes": len(spawns),
+                "seconds": round(time.monotonic() - started, 2),
+            }
+        return results
+
+
+def check_budget(results, budget):
+    """Return one message per metric that went over its recorded budget"""
+    failures = []
+    for name, counts in results.items():
+        if name not in budget:
+            failures.append(f"{name}: no recorded budget (run with --record)")
+            continue
+        for metric in METRICS:
+            limit = budget[name].get(metric)
+            if limit is not None and counts[metric] > limit:
+                failures.append(f"{name}: {metric} {counts[metric]} > budget {limit}")
+    return failures
+
+
+def load_budget():
+    with open(BUDGET_FILE, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def test_push_budget():
+    failures = check_budget(run_scenarios(), load_budget())
+    assert not failures, "\n".join(failures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=25, help="one-way latency per chunk")
+    parser.add_argument("--bandwidth-kbps", type=int, default=0, help="bandwidth cap in KiB/s (0 = none)")
+    parser.add_argument("--record", action="store_true", help="write current counts as the new budget")
+    parser.add_argument("--serve", nargs=2, metavar=("SERVICE", "REPO"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return serve(*args.serve)
+
+    results = run_scenarios(args.latency_ms, args.bandwidth_kbps)
+    print(f"{'scenario':<14}" + "".join(f"{m:>20}" for m in METRICS) + f"{'seconds':>10}")
+    for name, counts in results.items():
+        print(f"{name:<14}" + "".join(f"{counts[m]:>20}" for m in METRICS) + f"{counts['seconds']:>10}")
+
+    if args.record:
+        budget = {name: {m: counts[m] for m in METRICS} for name, counts in results.items()}
+        with open(BUDGET_FILE, "w", encoding="utf-8") as fh:
+            json.dump(budget, fh, indent=2)
+            fh.write("\n")
+        print(f"✅ Budget recorded to {os.path.basename(BUDGET_FILE)}")
+        return 0
+
+    failures = check_budget(results, load_budget())
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Checks for the adaptive transfer profile in base/transfer_profile.sh and push_it.sh.
+Reuses the ext:: sandbox from test_push_budget.py.
+Run with: python -m pytest -q test_transfer_profile.py
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+
+from test_push_budget import HERE, PUSH_SCRIPT, read_lines, sandbox
+
+PROFILE_LIB = os.path.join(HERE, "base", "transfer_profile.sh")
+MiB = 1048576
+
+
+def profile_lib(snippet, env=None):
+    """Run snippet in bash with transfer_profile.sh sourced and return its stdout"""
+    result = subprocess.run(["bash", "-c", f"source {shlex.quote(PROFILE_LIB)}; {snippet}"],
+                            capture_output=True, text=True, check=True, env=env)
+    return result.stdout.strip()
+
+
+def log_row(remote, bytes_, wall_ms, link_bps, link_ms, profile="balanced", cores=4):
+    return "\t".join(map(str, ["2026-01-01T00:00:00", remote, profile, cores,
+                                bytes_, wall_ms, link_bps, link_ms, 0])) + "\n"
+
+
+def test_parse_push_progress(tmp_path):
+    progress = tmp_path / "progress"
+    progress.write_text(
+        "Enumerating objects: 5, done.\n"
+        "Writing objects:  40% (2/5)\rWriting objects: 100% (5/5), 3.50 GiB | 1.25 MiB/s, done.\n"
+        "Total 5 (delta 0), reused 0 (delta 0)\n"
+        "write_start_ms 1700000000123\n")
+    assert profile_lib(f"parse_push_progress {progress}") == f"{int(3.5 * 1024 * MiB)} 1700000000123"
+
+    progress.write_text("Writing objects: 100% (3/3), 280 bytes | 280.00 KiB/s, done.\n")
+    assert profile_lib(f"parse_push_progress {progress}") == "280 0"
+
+    # Localized progress is why push_it.sh pushes with LC_ALL=C
+    progress.write_text("Objekte schreiben: 100% (3/3), 1.00 MiB | 1.00 MiB/s, fertig.\n")
+    assert profile_lib(f"parse_push_progress {progress}") == "0 0"
+
+
+def test_stamp_progress_marks_when_writing_starts(tmp_path):
+    log = tmp_path / "progress"
+    out = profile_lib(
+        f"printf 'Counting objects: 3\\rWriting objects: 100%% (3/3), 1.00 MiB | 9 MiB/s, done.\\n' "
+        f"| stamp_progress {log} 2>/dev/null; parse_push_progress {log}")
+    bytes_, started = out.split()
+    assert bytes_ == str(MiB) and int(started) > 0
+    assert b"Counting objects: 3\r" in log.read_bytes()
+
+
+def test_link_history_uses_median_of_recent_samples(tmp_path):
+    log = tmp_path / "pusher-transfer.log"
+    remote = "https://example.com/r.git"
+    log.write_text(
+        log_row(remote, 5 * MiB, 1000, 50 * MiB, 100)            # dropped: older than last five
+        + log_row("https://other/x.git", 5 * MiB, 1000, 1, 1000)  # other remote
+        + log_row(remote, 1000, 10, 1, 10)                        # too small to sample
+        + "2026-01-01\t" + remote + "\tlan\t4\t9999999\t100\t9\t0\n"  # pre-link_ms row
+        + "".join(log_row(remote, 5 * MiB, 1000, bps, ms) for bps, ms in
+                  [(400000, 900), (300000, 800), (200000, 700), (900000, 100), (100000, 600)]))
+    assert profile_lib(f"link_history {log} {remote}") == "300000 70"
+    assert profile_lib(f"link_history {tmp_path / 'missing'} {remote}") == "0 0"
+
+
+def test_pick_profile():
+    cases = {
+        (0, 0, 8): "default",
+        (20 * MiB, 10, 8): "lan",
+        (3 * MiB, 90, 8): "balanced",
+        (300000, 90, 4): "slow",
+        (300000, 30, 4): "balanced",   # CPU/handshake dominates: no extra compression
+        (300000, 90, 1): "balanced",   # no spare core to compress with
+    }
+    for (bps, pct, cores), expected in cases.items():
+        assert profile_lib(f"pick_profile {bps} {pct} {cores}") == expected, (bps, pct, cores)
+    assert profile_lib("profile_args default 4; echo ${#TRANSFER_ARGS[@]}") == "0"
+    assert "pack.window=50" in profile_lib('profile_args slow 4; echo "${TRANSFER_ARGS[@]}"')
+
+
+def test_push_picks_profile_from_history_and_records_it():
+    with sandbox(latency_ms=0) as box:
+        env, url, project = box["env"], box["url"], box["project"]
+        subprocess.run([box["real"]["git"], "init", "-q", project], check=True, env=env)
+        log = os.path.join(project, ".git", "pusher-transfer.log")
+        with open(log, "w", encoding="utf-8") as fh:
+            fh.write(log_row(url, 5 * MiB, 20000, 300000, 17000) * 3)
+
+        env = dict(env, NUMBER_OF_PROCESSORS="4")
+        result = subprocess.run(["bash", PUSH_SCRIPT, project, "v1.0", url, "main", "Seeded"],
+                                env=env, capture_output=True, text=True, check=True)
+        assert "Transfer profile: slow (4 cores" in result.stdout
+
+        rows = read_lines(log)
+        assert len(rows) == 4
+        fields = rows[-1].split("\t")
+        assert len(fields) == 9
+        assert fields[1:4] == [url, "slow", "4"]
+        assert int(fields[4]) > 0 and int(fields[6]) > 0
+        assert fields[8] == "300000"
+
+
+def test_wire_rate_matches_a_capped_link():
+    """Packing speed or buffering must not read as link speed"""
+    with sandbox(latency_ms=0, bandwidth_kbps=256) as box:
+        with open(os.path.join(box["project"], "blob.bin"), "wb") as fh:
+            fh.write(os.urandom(MiB))
+        subprocess.run(["bash", PUSH_SCRIPT, box["project"], "v1.0", box["url"], "main", "Capped"],
+                       env=box["env"], capture_output=True, text=True, check=True)
+        row = read_lines(os.path.join(box["project"], ".git", "pusher-transfer.log"))[-1].split("\t")
+        assert 0.7 * 256 * 1024 <= int(row[6]) <= 1.3 * 256 * 1024, row
+
+
+def test_push_script_runs_from_a_backslash_path(tmp_path):
+    """The GUI passes C:\\...\\base\\push_it.sh; the helpers must still be found"""
+    os.makedirs(tmp_path / "app" / "base")
+    shutil.copy(PROFILE_LIB, tmp_path / "app" / "base")
+    shutil.copy(PUSH_SCRIPT, tmp_path / "app\\base\\push_it.sh")   # one file, Windows-style name
+    with sandbox(latency_ms=0) as box:
+        result = subprocess.run(
+            ["bash", "app\\base\\push_it.sh", box["project"], "v1.0", box["url"], "main", "Win path"],
+            cwd=tmp_path, env=box["env"], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert "Transfer profile:" in result.stdout